@@ -0,0 +1,233 @@
+"""
+_win_listener.py — Low-level Windows keyboard hook via ctypes.
+
+Installs a WH_KEYBOARD_LL hook on a dedicated thread and queues the
+virtual-key code of every key-down event, tagged with the Shift/Ctrl/Alt
+state at the time of the press.  Used by
+input_listener.KeyboardListener on Windows instead of pynput's listener,
+which builds several Python objects per event before we ever see it.
+
+Windows-only: importing this module elsewhere raises AttributeError.
+"""
+
+import ctypes
+import threading
+from collections import deque
+from collections.abc import Callable
+from ctypes import wintypes
+
+
+# Hook / message constants (winuser.h)
+WH_KEYBOARD_LL = 13
+HC_ACTION = 0
+WM_KEYDOWN = 0x0100
+WM_SYSKEYDOWN = 0x0104
+WM_QUIT = 0x0012
+PM_NOREMOVE = 0x0000
+MAPVK_VK_TO_VSC = 0
+VK_SHIFT = 0x10
+VK_CONTROL = 0x11
+VK_MENU = 0x12
+
+# A queued event is the vk code in the low byte plus these modifier bits
+VK_MASK = 0xFF
+MOD_SHIFT = 0x100
+MOD_CTRL = 0x200
+MOD_ALT = 0x400
+
+LRESULT = ctypes.c_ssize_t
+
+
+class KBDLLHOOKSTRUCT(ctypes.Structure):
+    _fields_ = [
+        ("vkCode", wintypes.DWORD),
+        ("scanCode", wintypes.DWORD),
+        ("flags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ctypes.c_size_t),  # ULONG_PTR
+    ]
+
+
+LowLevelKeyboardProc = ctypes.WINFUNCTYPE(
+    LRESULT, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM
+)
+
+# Private DLL handles so our argtypes don't clash with pynput's
+_user32 = ctypes.WinDLL("user32", use_last_error=True)
+_kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+_user32.SetWindowsHookExW.argtypes = (
+    ctypes.c_int, LowLevelKeyboardProc, wintypes.HINSTANCE, wintypes.DWORD,
+)
+_user32.SetWindowsHookExW.restype = wintypes.HHOOK
+_user32.CallNextHookEx.argtypes = (
+    wintypes.HHOOK, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM,
+)
+_user32.CallNextHookEx.restype = LRESULT
+_user32.UnhookWindowsHookEx.argtypes = (wintypes.HHOOK,)
+_user32.UnhookWindowsHookEx.restype = wintypes.BOOL
+_user32.GetMessageW.argtypes = (
+    ctypes.POINTER(wintypes.MSG), wintypes.HWND, wintypes.UINT, wintypes.UINT,
+)
+_user32.GetMessageW.restype = wintypes.BOOL
+_user32.PeekMessageW.argtypes = (
+    ctypes.POINTER(wintypes.MSG), wintypes.HWND,
+    wintypes.UINT, wintypes.UINT, wintypes.UINT,
+)
+_user32.PeekMessageW.restype = wintypes.BOOL
+_user32.PostThreadMessageW.argtypes = (
+    wintypes.DWORD, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM,
+)
+_user32.PostThreadMessageW.restype = wintypes.BOOL
+_user32.GetAsyncKeyState.argtypes = (ctypes.c_int,)
+_user32.GetAsyncKeyState.restype = ctypes.c_short
+_user32.GetForegroundWindow.restype = wintypes.HWND
+_user32.GetWindowThreadProcessId.argtypes = (
+    wintypes.HWND, ctypes.POINTER(wintypes.DWORD),
+)
+_user32.GetWindowThreadProcessId.restype = wintypes.DWORD
+_user32.GetKeyboardLayout.argtypes = (wintypes.DWORD,)
+_user32.GetKeyboardLayout.restype = wintypes.HKL
+_user32.MapVirtualKeyExW.argtypes = (wintypes.UINT, wintypes.UINT, wintypes.HKL)
+_user32.MapVirtualKeyExW.restype = wintypes.UINT
+_user32.ToUnicodeEx.argtypes = (
+    wintypes.UINT, wintypes.UINT, ctypes.POINTER(ctypes.c_ubyte),
+    wintypes.LPWSTR, ctypes.c_int, wintypes.UINT, wintypes.HKL,
+)
+_user32.ToUnicodeEx.restype = ctypes.c_int
+_kernel32.GetModuleHandleW.argtypes = (wintypes.LPCWSTR,)
+_kernel32.GetModuleHandleW.restype = wintypes.HMODULE
+_kernel32.GetCurrentThreadId.restype = wintypes.DWORD
+
+
+# Keyboard layout handle → character table, indexed [modifier bits >> 8][vk]
+_char_tables: dict[int, list[list[str | None]]] = {}
+
+
+def foreground_layout() -> int:
+    """Return the keyboard layout (HKL) of the foreground window's thread."""
+    thread_id = _user32.GetWindowThreadProcessId(_user32.GetForegroundWindow(), None)
+    return _user32.GetKeyboardLayout(thread_id) or 0
+
+
+def vk_to_char(event: int, layout: int) -> str | None:
+    """
+    Return the character a queued hook *event* types in *layout*, if any.
+
+    Resolved the way pynput's win32 KeyTranslator does it, so names stay
+    identical: Shift, Ctrl and Alt select the table (Ctrl+Alt is AltGr),
+    Caps Lock is ignored and dead keys report their own character.
+    """
+    table = _char_tables.get(layout)
+    if table is None:
+        table = _char_tables[layout] = _build_char_table(layout)
+    return table[event >> 8][event & VK_MASK]
+
+
+def _build_char_table(layout: int) -> list[list[str | None]]:
+    """
+    Translate every vk code under each modifier combination with ToUnicodeEx.
+
+    ToUnicodeEx updates the calling thread's dead-key buffer, so this is
+    done once per layout rather than per key press, and never from the
+    hook callback.
+    """
+    state = (ctypes.c_ubyte * 256)()
+    out = ctypes.create_unicode_buffer(5)
+    scans = [_user32.MapVirtualKeyExW(vk, MAPVK_VK_TO_VSC, layout) for vk in range(256)]
+    table = []
+    for mods in range(8):
+        state[VK_SHIFT] = 0x80 if mods & (MOD_SHIFT >> 8) else 0x00
+        state[VK_CONTROL] = 0x80 if mods & (MOD_CTRL >> 8) else 0x00
+        state[VK_MENU] = 0x80 if mods & (MOD_ALT >> 8) else 0x00
+        chars: list[str | None] = [None] * 256
+        for vk, scan in enumerate(scans):
+            count = _user32.ToUnicodeEx(vk, scan, state, out, len(out), 0, layout)
+            if count == 0:
+                continue
+            chars[vk] = out[0]
+            if count < 0:
+                # Dead key: translate again to flush it from the buffer
+                _user32.ToUnicodeEx(vk, scan, state, out, len(out), 0, layout)
+        table.append(chars)
+    return table
+
+
+class LowLevelKeyboardHook:
+    """
+    Runs a WH_KEYBOARD_LL hook on its own message-pumping thread.
+
+    The hook callback does the minimum possible work — it reads
+    ``KBDLLHOOKSTRUCT.vkCode``, ORs in the MOD_* bits for the modifiers
+    held right now, appends that to ``events`` and calls *on_queued* — and
+    always chains to the next hook.  Consumers popleft
+    ``events`` from any thread.
+    """
+
+    def __init__(self, on_queued: Callable[[], None]):
+        self.events: deque[int] = deque()
+        self._on_queued = on_queued
+        self._thread: threading.Thread | None = None
+        self._thread_id = 0
+        self._ready = threading.Event()
+        # Keep the C callback alive for as long as the hook is installed
+        self._proc = LowLevelKeyboardProc(self._callback)
+
+    def start(self) -> None:
+        """Install the hook on a new daemon thread."""
+        if self._thread is not None:
+            return
+        self._ready.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="KeyboardHook", daemon=True
+        )
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self) -> None:
+        """Remove the hook and end the hook thread."""
+        if self._thread is None:
+            return
+        _user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+        self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def _run(self) -> None:
+        """Hook-thread body: install the hook and pump messages."""
+        msg = wintypes.MSG()
+        self._thread_id = _kernel32.GetCurrentThreadId()
+        # Force creation of this thread's message queue so stop() can
+        # post WM_QUIT even before the first GetMessageW call.
+        _user32.PeekMessageW(ctypes.byref(msg), None, 0, 0, PM_NOREMOVE)
+
+        hook = _user32.SetWindowsHookExW(
+            WH_KEYBOARD_LL, self._proc, _kernel32.GetModuleHandleW(None), 0
+        )
+        self._ready.set()
+        if not hook:
+            return
+
+        # Low-level hooks are called from this thread's message loop
+        try:
+            while _user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                pass
+        finally:
+            _user32.UnhookWindowsHookEx(hook)
+
+    def _callback(self, n_code: int, w_param: int, l_param: int) -> int:
+        """LowLevelKeyboardProc: queue the vk code of key-down events."""
+        if n_code == HC_ACTION and (w_param == WM_KEYDOWN or w_param == WM_SYSKEYDOWN):
+            info = ctypes.cast(l_param, ctypes.POINTER(KBDLLHOOKSTRUCT)).contents
+            event = info.vkCode
+            # Sample modifiers now: by the time the GUI thread drains the
+            # queue they may already be released
+            key_state = _user32.GetAsyncKeyState
+            if key_state(VK_SHIFT) & 0x8000:
+                event |= MOD_SHIFT
+            if key_state(VK_CONTROL) & 0x8000:
+                event |= MOD_CTRL
+            if key_state(VK_MENU) & 0x8000:
+                event |= MOD_ALT
+            self.events.append(event)
+            self._on_queued()
+        return _user32.CallNextHookEx(None, n_code, w_param, l_param)
@@ -3,27 +3,135 @@ action_executor.py — Mouse click simulation and window detection.
 
 Handles moving the cursor, performing clicks, and checking whether
 the target application window is in the foreground.
+
+On Windows a click (move, press, release and optional restore) is sent
+as one batched SendInput call; other platforms go through pynput.
+
+The foreground check is event-driven: WinEvent hooks running on a
+background thread recompute a cached flag whenever the foreground
+window or its title changes, so the per-keypress check is a plain
+attribute read.
 """
 
+import ctypes
+import sys
+import threading
+
 from pynput.mouse import Button, Controller as MouseController
 
-try:
-    import win32gui  # type: ignore
-    _HAS_WIN32 = True
-except ImportError:
-    _HAS_WIN32 = False
+# win32gui is imported lazily by _load_win32gui() the first time the
+# foreground check is used; None afterwards means pywin32 is missing.
+_UNSET = object()
+_win32gui = _UNSET
 
 
 # Module-level mouse controller (thread-safe for pynput)
 _mouse = MouseController()
 
+# SendInput constants (winuser.h)
+INPUT_MOUSE = 0
+MOUSEEVENTF_MOVE = 0x0001
+MOUSEEVENTF_LEFTDOWN = 0x0002
+MOUSEEVENTF_LEFTUP = 0x0004
+MOUSEEVENTF_VIRTUALDESK = 0x4000
+MOUSEEVENTF_ABSOLUTE = 0x8000
+SM_XVIRTUALSCREEN = 76
+SM_YVIRTUALSCREEN = 77
+SM_CXVIRTUALSCREEN = 78
+SM_CYVIRTUALSCREEN = 79
+
+_HAS_SENDINPUT = sys.platform == "win32"
+
+if _HAS_SENDINPUT:
+    from ctypes import wintypes
+
+    class MOUSEINPUT(ctypes.Structure):
+        _fields_ = [
+            ("dx", wintypes.LONG),
+            ("dy", wintypes.LONG),
+            ("mouseData", wintypes.DWORD),
+            ("dwFlags", wintypes.DWORD),
+            ("time", wintypes.DWORD),
+            ("dwExtraInfo", ctypes.c_size_t),  # ULONG_PTR
+        ]
+
+    class INPUT(ctypes.Structure):
+        # MOUSEINPUT is the largest member of the INPUT union, so a
+        # mouse-only layout has the same size Windows expects.
+        _fields_ = [("type", wintypes.DWORD), ("mi", MOUSEINPUT)]
+
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+    _user32.SendInput.argtypes = (wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int)
+    _user32.SendInput.restype = wintypes.UINT
+    _user32.GetCursorPos.argtypes = (ctypes.POINTER(wintypes.POINT),)
+    _user32.GetCursorPos.restype = wintypes.BOOL
+    _user32.GetSystemMetrics.argtypes = (ctypes.c_int,)
+    _user32.GetSystemMetrics.restype = ctypes.c_int
+
+    _MOVE_FLAGS = MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE | MOUSEEVENTF_VIRTUALDESK
+    _SIZEOF_INPUT = ctypes.sizeof(INPUT)
+
+# WinEvent constants (winuser.h)
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_OBJECT_NAMECHANGE = 0x800C
+WINEVENT_OUTOFCONTEXT = 0x0000
+OBJID_WINDOW = 0
+CHILDID_SELF = 0
+
+if sys.platform == "win32":
+    WinEventProc = ctypes.WINFUNCTYPE(
+        None,
+        wintypes.HANDLE,  # hWinEventHook
+        wintypes.DWORD,   # event
+        wintypes.HWND,    # hwnd
+        wintypes.LONG,    # idObject
+        wintypes.LONG,    # idChild
+        wintypes.DWORD,   # idEventThread
+        wintypes.DWORD,   # dwmsEventTime
+    )
+
+    # Same private user32 handle as SendInput, so pynput's argtypes and
+    # ours never clash
+    _user32.SetWinEventHook.argtypes = (
+        wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, WinEventProc,
+        wintypes.DWORD, wintypes.DWORD, wintypes.DWORD,
+    )
+    _user32.SetWinEventHook.restype = wintypes.HANDLE
+    _user32.UnhookWinEvent.argtypes = (wintypes.HANDLE,)
+    _user32.UnhookWinEvent.restype = wintypes.BOOL
+    _user32.GetWindowThreadProcessId.argtypes = (
+        wintypes.HWND, ctypes.POINTER(wintypes.DWORD),
+    )
+    _user32.GetWindowThreadProcessId.restype = wintypes.DWORD
+    _user32.GetMessageW.argtypes = (
+        ctypes.POINTER(wintypes.MSG), wintypes.HWND, wintypes.UINT, wintypes.UINT,
+    )
+    _user32.GetMessageW.restype = wintypes.BOOL
+    _user32.TranslateMessage.argtypes = (ctypes.POINTER(wintypes.MSG),)
+    _user32.TranslateMessage.restype = wintypes.BOOL
+    _user32.DispatchMessageW.argtypes = (ctypes.POINTER(wintypes.MSG),)
+    _user32.DispatchMessageW.restype = ctypes.c_ssize_t  # LRESULT
+
+# Foreground-tracking state, written by the hook thread
+_target_title_lower: str | None = None
+_target_is_foreground = True
+_hook_failed = False  # SetWinEventHook failed: poll on each check instead
+_foreground_hwnd = 0  # last window reported by EVENT_SYSTEM_FOREGROUND
+_hook_thread: threading.Thread | None = None
+_hook_lock = threading.Lock()
+
 
 def execute_click(x: int, y: int, restore_position: bool = True) -> None:
     """
     Move the cursor to (x, y), perform a left click, and optionally
     restore the cursor to its original position.
     """
-    original = _mouse.position  # save current position
+    if _HAS_SENDINPUT:
+        _send_click(x, y, restore_position)
+        return
+
+    # Only query the cursor when we need to put it back
+    original = _mouse.position if restore_position else None
 
     _mouse.position = (x, y)
     _mouse.click(Button.left)
@@ -32,20 +140,200 @@ def execute_click(x: int, y: int, restore_position: bool = True) -> None:
         _mouse.position = original
 
 
+def _send_click(x: int, y: int, restore_position: bool) -> None:
+    """Issue the whole click as a single SendInput call."""
+    left = _user32.GetSystemMetrics(SM_XVIRTUALSCREEN)
+    top = _user32.GetSystemMetrics(SM_YVIRTUALSCREEN)
+    width = _user32.GetSystemMetrics(SM_CXVIRTUALSCREEN)
+    height = _user32.GetSystemMetrics(SM_CYVIRTUALSCREEN)
+
+    def _abs(value: int, origin: int, size: int) -> int:
+        # Smallest normalised coordinate that lands on pixel *value*
+        return min(65535, max(0, ((value - origin) * 65536 + size - 1) // size))
+
+    def _move(px: int, py: int) -> INPUT:
+        return INPUT(INPUT_MOUSE, MOUSEINPUT(
+            _abs(px, left, width), _abs(py, top, height), 0, _MOVE_FLAGS, 0, 0
+        ))
+
+    records = [
+        _move(x, y),
+        INPUT(INPUT_MOUSE, MOUSEINPUT(0, 0, 0, MOUSEEVENTF_LEFTDOWN, 0, 0)),
+        INPUT(INPUT_MOUSE, MOUSEINPUT(0, 0, 0, MOUSEEVENTF_LEFTUP, 0, 0)),
+    ]
+
+    if restore_position:
+        original = wintypes.POINT()
+        if _user32.GetCursorPos(ctypes.byref(original)):
+            records.append(_move(original.x, original.y))
+
+    batch = (INPUT * len(records))(*records)
+    _user32.SendInput(len(records), batch, _SIZEOF_INPUT)
+
+
+def watch_foreground_window(window_title: str) -> None:
+    """
+    Start tracking whether the foreground window's title contains
+    *window_title* (case-insensitive substring match).
+
+    Installs the EVENT_SYSTEM_FOREGROUND hook on first use; later calls
+    only swap the title and re-evaluate the current foreground window.
+    """
+    global _target_title_lower, _hook_thread
+
+    _target_title_lower = window_title.lower()
+    _update_foreground(_get_foreground_window())
+
+    if _load_win32gui() is None:
+        return
+
+    with _hook_lock:
+        if _hook_thread is None:
+            _hook_thread = threading.Thread(
+                target=_run_foreground_hook, name="ForegroundHook", daemon=True
+            )
+            _hook_thread.start()
+
+
 def is_target_window_foreground(window_title: str) -> bool:
     """
-    Check whether the foreground window's title contains *window_title*
-    (case-insensitive substring match).
+    Return whether the foreground window's title contains *window_title*
+    (case-insensitive substring match), as last seen by the hook.
 
     Returns True if win32gui is unavailable (fail-open) so the app
     still works even without pywin32.
     """
-    if not _HAS_WIN32:
-        return True  # fail-open
+    return is_target_window_foreground_lower(window_title.lower())
+
+
+def is_target_window_foreground_lower(title_lower: str) -> bool:
+    """Like is_target_window_foreground, for an already-lowercased title."""
+    # Without win32gui the watch leaves the flag True (fail-open)
+    if title_lower != _target_title_lower:
+        watch_foreground_window(title_lower)
+    elif _hook_failed:
+        _update_foreground(_get_foreground_window())
+    return _target_is_foreground
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Foreground hook internals
+# ──────────────────────────────────────────────────────────────────────
+
+def _load_win32gui():
+    """Import win32gui on first call; return it, or None if unavailable."""
+    global _win32gui
+    if _win32gui is _UNSET:
+        try:
+            import win32gui  # type: ignore
+        except ImportError:
+            win32gui = None
+        _win32gui = win32gui
+    return _win32gui
+
+
+def _get_foreground_window() -> int:
+    win32gui = _load_win32gui()
+    if win32gui is None:
+        return 0
+    try:
+        return win32gui.GetForegroundWindow()
+    except Exception:
+        return 0
+
+
+def _update_foreground(hwnd: int) -> None:
+    """Recompute the cached flag for *hwnd* against the target title."""
+    global _target_is_foreground
+
+    win32gui = _load_win32gui()
+    if win32gui is None or _target_title_lower is None:
+        _target_is_foreground = True
+        return
 
     try:
-        hwnd = win32gui.GetForegroundWindow()
         fg_title = win32gui.GetWindowText(hwnd)
-        return window_title.lower() in fg_title.lower()
+        _target_is_foreground = _target_title_lower in fg_title.lower()
     except Exception:
-        return True  # fail-open on errors
+        _target_is_foreground = True  # fail-open on errors
+
+
+def _run_foreground_hook() -> None:
+    """
+    Hook-thread body: register the WinEvent hooks and pump messages.
+
+    EVENT_SYSTEM_FOREGROUND (global) covers switching windows;
+    EVENT_OBJECT_NAMECHANGE covers the foreground window's title changing
+    in place, e.g. a tab or document switch.  The name-change hook is
+    scoped to the foreground window's process and moved on every switch,
+    so name changes elsewhere on the desktop never reach Python.
+
+    Out-of-context WinEvent callbacks are delivered through the message
+    queue of the thread that installed the hook, so this thread must
+    keep running GetMessageW for the callback to fire.
+    """
+    global _foreground_hwnd, _hook_failed, _target_is_foreground
+
+    name_hook = None
+    name_pid = 0
+
+    def _watch_names(hwnd: int) -> None:
+        """Move the name-change hook to the process owning *hwnd*."""
+        nonlocal name_hook, name_pid
+        global _hook_failed
+        pid = wintypes.DWORD()
+        _user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+        if name_hook and pid.value == name_pid:
+            return
+        if name_hook:
+            _user32.UnhookWinEvent(name_hook)
+            name_hook = None
+        name_pid = pid.value
+        if name_pid:
+            name_hook = _user32.SetWinEventHook(
+                EVENT_OBJECT_NAMECHANGE, EVENT_OBJECT_NAMECHANGE, None, proc,
+                name_pid, 0, WINEVENT_OUTOFCONTEXT,
+            )
+        # Title changes go unseen without it: poll on each check instead
+        _hook_failed = not name_hook
+
+    def _callback(hook, event, hwnd, id_object, id_child, thread_id, timestamp):
+        global _foreground_hwnd
+        hwnd = hwnd or 0
+        if event == EVENT_SYSTEM_FOREGROUND:
+            _foreground_hwnd = hwnd
+            _watch_names(hwnd)
+            _update_foreground(hwnd)
+        elif (hwnd == _foreground_hwnd and id_object == OBJID_WINDOW
+                and id_child == CHILDID_SELF):
+            _update_foreground(hwnd)
+
+    # Keep a reference for the lifetime of the thread, or ctypes frees it
+    proc = WinEventProc(_callback)
+
+    fg_hook = _user32.SetWinEventHook(
+        EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND, None, proc,
+        0, 0, WINEVENT_OUTOFCONTEXT,
+    )
+    if not fg_hook:
+        # The flag was last computed against whatever window was in front
+        # when the watch started (usually KeyClick itself), so it must not
+        # be trusted: fall back to checking the title on every key press.
+        _hook_failed = True
+        _target_is_foreground = True
+        return
+
+    # Catch any change that happened before the hooks were in place
+    _foreground_hwnd = _get_foreground_window()
+    _watch_names(_foreground_hwnd)
+    _update_foreground(_foreground_hwnd)
+
+    msg = wintypes.MSG()
+    try:
+        while _user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            _user32.TranslateMessage(ctypes.byref(msg))
+            _user32.DispatchMessageW(ctypes.byref(msg))
+    finally:
+        if name_hook:
+            _user32.UnhookWinEvent(name_hook)
+        _user32.UnhookWinEvent(fg_hook)
@@ -5,10 +5,14 @@ Handles loading, saving, and mutating the application config file
 (config.json) which stores key→coordinate mappings and user settings.
 """
 
+import atexit
 import json
 import os
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from PyQt6.QtCore import QTimer
 
 
 # Default configuration template
@@ -22,9 +26,23 @@ DEFAULT_CONFIG: Dict[str, Any] = {
 }
 
 
+def _default_config() -> Dict[str, Any]:
+    """Return a fresh copy of DEFAULT_CONFIG (values are flat scalars)."""
+    return {
+        "mappings": {},
+        "settings": dict(DEFAULT_CONFIG["settings"]),
+    }
+
+
+# Delay (ms) used to coalesce bursts of mutations into a single write
+SAVE_DEBOUNCE_MS = 250
+
+
 class ConfigManager:
     """Manages persistent JSON configuration for the application."""
 
+    __slots__ = ("_path", "_data", "_dirty", "_flush_timer", "__weakref__")
+
     def __init__(self, config_path: Optional[str] = None):
         # Default to config.json next to this script
         if config_path is None:
@@ -34,6 +52,15 @@ class ConfigManager:
             self._path = Path(config_path)
 
         self._data: Dict[str, Any] = {}
+
+        # Debounced writes: save() only marks the config dirty and
+        # (re)starts the timer; flush() does the actual disk write.
+        self._dirty = False
+        self._flush_timer = QTimer()
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self.flush)
+        atexit.register(self.flush)
+
         self.load()
 
     # ------------------------------------------------------------------
@@ -42,28 +69,41 @@ class ConfigManager:
 
     def load(self) -> None:
         """Load config from disk, or create default if missing/corrupt."""
-        if self._path.exists():
-            try:
-                with open(self._path, "r", encoding="utf-8") as f:
-                    self._data = json.load(f)
-                # Ensure required top-level keys exist
-                if "mappings" not in self._data:
-                    self._data["mappings"] = {}
-                if "settings" not in self._data:
-                    self._data["settings"] = dict(DEFAULT_CONFIG["settings"])
-                return
-            except (json.JSONDecodeError, OSError):
-                pass  # Fall through to default
+        try:
+            raw = self._path.read_bytes()  # FileNotFoundError is an OSError
+            if not raw:
+                raise ValueError("empty config file")
+            self._data = json.loads(raw)
+            # Ensure required top-level keys exist
+            if "mappings" not in self._data:
+                self._data["mappings"] = {}
+            if "settings" not in self._data:
+                self._data["settings"] = dict(DEFAULT_CONFIG["settings"])
+            return
+        except (OSError, ValueError):  # includes json.JSONDecodeError
+            pass  # Fall through to default
 
         # Create default config
-        self._data = json.loads(json.dumps(DEFAULT_CONFIG))  # deep copy
+        self._data = _default_config()
         self.save()
 
     def save(self) -> None:
-        """Write current config to disk."""
+        """Schedule a write of the current config to disk."""
+        self._dirty = True
+        self._flush_timer.start(SAVE_DEBOUNCE_MS)
+
+    def flush(self) -> None:
+        """Write current config to disk if there are pending changes."""
+        if not self._dirty:
+            return
+        self._dirty = False
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self._path, "w", encoding="utf-8") as f:
-            json.dump(self._data, f, indent=2)
+        # Serialise in one go and swap the file in atomically, so a crash
+        # mid-write never leaves a truncated config.json behind.
+        data = json.dumps(self._data, indent=2).encode("utf-8")
+        tmp = self._path.with_suffix(".json.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, self._path)
 
     # ------------------------------------------------------------------
     # Mappings CRUD
@@ -73,6 +113,10 @@ class ConfigManager:
         """Return all key→{x, y} mappings."""
         return dict(self._data.get("mappings", {}))
 
+    def mappings_view(self) -> Mapping[str, Dict[str, int]]:
+        """Return a read-only live view of the mappings (no copy)."""
+        return MappingProxyType(self._data["mappings"])
+
     def set_mapping(self, key: str, x: int, y: int) -> None:
         """Add or update a mapping and persist."""
         self._data["mappings"][key] = {"x": x, "y": y}
@@ -101,6 +145,10 @@ class ConfigManager:
         """Return a copy of the settings dict."""
         return dict(self._data.get("settings", {}))
 
+    def settings_view(self) -> Mapping[str, Any]:
+        """Return a read-only live view of the settings (no copy)."""
+        return MappingProxyType(self._data["settings"])
+
     def get_setting(self, key: str, default: Any = None) -> Any:
         """Return a single setting value."""
         return self._data.get("settings", {}).get(key, default)
@@ -2,13 +2,45 @@
 input_listener.py — Global keyboard and mouse input capture.
 
 Provides threaded listeners for keyboard key presses and single mouse-click
-capture using pynput, bridged to the Qt event loop via signals.
+capture.  Key presses are queued for the controller to drain on the GUI
+thread; mouse clicks are bridged to the Qt event loop via a signal.  On
+Windows key presses come from a ctypes WH_KEYBOARD_LL hook (_win_listener);
+elsewhere, and for mouse capture, pynput is used.
 """
 
+import sys
 import threading
+from collections import deque
 from pynput import keyboard, mouse
 from PyQt6.QtCore import QObject, pyqtSignal
 
+_USE_WIN_HOOK = sys.platform == "win32"
+if _USE_WIN_HOOK:
+    from _win_listener import (
+        VK_MASK, LowLevelKeyboardHook, foreground_layout, vk_to_char,
+    )
+
+
+def _build_vk_names() -> dict[int, str]:
+    """
+    Map each special key's vk code to its normalised name.
+
+    Distinct members can share a vk (on win32, Key.alt_r and Key.alt_gr
+    are both VK_RMENU).  pynput resolves vk codes with a dict built the
+    same way, so the last member wins here too and names match what its
+    listener reported (e.g. "alt_gr").
+    """
+    names: dict[int, str] = {}
+    for special in keyboard.Key:
+        vk = getattr(special.value, "vk", None)
+        if vk is not None:
+            names[vk] = special.name.lower()
+    return names
+
+
+# vk code → normalised name for special keys, built once at import
+_VK_NAMES = _build_vk_names()
+
 
 def normalise_key(key) -> str:
     """
@@ -31,21 +63,51 @@ def normalise_key(key) -> str:
     return str(key).lower()
 
 
+def normalise_vk(event: int, layout: int) -> str:
+    """
+    Convert a queued hook event (vk code plus modifier bits) to the same
+    string normalise_key produces for the key pynput would report, with
+    characters resolved in keyboard *layout*.
+
+    Examples:
+        0x70 (VK_F1)          → "f1"
+        0x41 ('A')            → "a"
+        0x31 ('1') + Shift    → "!"  (US layout)
+    """
+    vk = event & VK_MASK
+    name = _VK_NAMES.get(vk)
+    if name is not None:
+        return name
+    char = vk_to_char(event, layout)
+    if char is not None:
+        return char.lower()
+    return f"vk_{vk}"
+
+
 class KeyboardListener(QObject):
     """
-    Wraps pynput.keyboard.Listener to emit Qt signals for each key press.
+    Collects global key presses for the controller to drain.
 
-    The listener runs in a daemon thread so it doesn't block the UI.
+    On Windows a low-level keyboard hook queues vk codes, tagged with the
+    modifier state, from its own daemon thread; elsewhere this wraps
+    pynput.keyboard.Listener, which queues normalised key names.  Nothing
+    crosses into Qt per event: the first key queued after a drain() emits
+    keys_available once, and the controller then drains the whole burst
+    on the GUI thread.
 
     Signals:
-        key_pressed(str): emitted with the normalised key name on key-down.
+        keys_available(): Emitted (from the listener thread) when keys are
+            queued and no wake-up is outstanding.
     """
 
-    key_pressed = pyqtSignal(str)
+    keys_available = pyqtSignal()
 
     def __init__(self):
         super().__init__()
         self._listener: keyboard.Listener | None = None
+        self._hook: "LowLevelKeyboardHook | None" = None
+        self._pending: deque[str] = deque()
+        self._wake_pending = False
         self._running = False
 
     def start(self) -> None:
@@ -53,6 +115,12 @@ class KeyboardListener(QObject):
         if self._running:
             return
         self._running = True
+        if _USE_WIN_HOOK:
+            # Translate the current layout up front, not on the first press
+            vk_to_char(0, foreground_layout())
+            self._hook = LowLevelKeyboardHook(self._notify)
+            self._hook.start()
+            return
         self._listener = keyboard.Listener(on_press=self._on_press)
         self._listener.daemon = True
         self._listener.start()
@@ -60,16 +128,58 @@ class KeyboardListener(QObject):
     def stop(self) -> None:
         """Stop the keyboard listener."""
         self._running = False
+        if self._hook is not None:
+            self._hook.stop()
+            self._hook = None
         if self._listener is not None:
             self._listener.stop()
             self._listener = None
 
+    def drain(self) -> list[str]:
+        """Pop and return the normalised names of all keys pressed since
+        the last call, oldest first."""
+        # Re-arm before popping: a key queued from here on either gets
+        # popped below or emits a fresh keys_available, never neither.
+        self._wake_pending = False
+        if self._hook is not None:
+            events = self._hook.events
+            if not events:
+                return []
+            popleft = events.popleft
+            layout = foreground_layout()
+            names = []
+            while events:
+                names.append(normalise_vk(popleft(), layout))
+            return names
+
+        pending = self._pending
+        if not pending:
+            return []
+        popleft = pending.popleft
+        names = []
+        while pending:
+            names.append(popleft())
+        return names
+
     def _on_press(self, key) -> None:
         """Callback invoked by pynput in the listener thread."""
         if not self._running:
             return
-        name = normalise_key(key)
-        self.key_pressed.emit(name)
+        # Fast path: special keys resolve with one dict lookup by vk code
+        vk = getattr(key, "vk", None)
+        if vk is None:
+            vk = getattr(getattr(key, "value", None), "vk", None)
+        name = _VK_NAMES.get(vk)
+        if name is None:
+            name = normalise_key(key)
+        self._pending.append(name)
+        self._notify()
+
+    def _notify(self) -> None:
+        """Wake the GUI thread once per burst of queued keys."""
+        if not self._wake_pending:
+            self._wake_pending = True
+            self.keys_available.emit()
 
 
 class MouseClickCapture(QObject):
@@ -12,9 +12,22 @@ from PyQt6.QtCore import QTimer
 from config_manager import ConfigManager
 from state_machine import StateMachine, AppState
 from input_listener import KeyboardListener, MouseClickCapture
-from action_executor import execute_click, is_target_window_foreground
+from action_executor import (
+    execute_click, is_target_window_foreground_lower, watch_foreground_window,
+)
 from mapping_manager import MappingManager
-from ui import MainWindow
+from ui import MainWindow, KeyClickProxyStyle, STYLESHEET
+
+
+# Pre-resolved states for the key-press hot path (enum members are
+# singletons, so these compare by identity)
+_S_NORMAL = AppState.NORMAL
+_S_WAIT_KEY = AppState.CONFIG_WAIT_KEY
+_S_WAIT_CLICK = AppState.CONFIG_WAIT_CLICK
+_S_DISABLED = AppState.DISABLED
+
+# Status-bar updates within this window (ms) are coalesced into one
+STATUS_COALESCE_MS = 50
 
 
 class AppController:
@@ -27,9 +40,22 @@ class AppController:
       • Dispatch key-press events to the action executor
     """
 
+    # Fixed attribute layout: the key-press path reads several of these
+    # per event.  __weakref__ lets PyQt hold weak refs to bound slots.
+    __slots__ = (
+        "config", "_cached_settings", "_target_title_lower",
+        "state_machine", "mapping_manager", "keyboard_listener",
+        "mouse_capture", "window", "_pending_key", "_fast_map",
+        "_pending_status", "__weakref__",
+    )
+
     def __init__(self):
         # ── Core components ──
         self.config = ConfigManager()
+        self._cached_settings = dict(self.config.get_settings())
+        self._target_title_lower = self._cached_settings.get(
+            "target_window_title", "Valeton"
+        ).lower()
         self.state_machine = StateMachine(AppState.NORMAL)
         self.mapping_manager = MappingManager(self.config)
         self.keyboard_listener = KeyboardListener()
@@ -41,10 +67,19 @@ class AppController:
         # ── Temp state for configuration flow ──
         self._pending_key: str | None = None
 
+        # ── Latest status message awaiting the coalescing timer ──
+        self._pending_status: str | None = None
+
+        # ── Flat key → (x, y) cache for the key-press hot path ──
+        self._fast_map: dict[str, tuple[int, int]] = {}
+        self._rebuild_fast_map()
+
         self._wire_signals()
         self._initialize_ui()
+        self._update_foreground_watch()
 
-        # Start keyboard listener
+        # Start keyboard listener; key presses are drained in batches on
+        # the GUI thread instead of one queued signal per event.
         self.keyboard_listener.start()
 
     # ──────────────────────────────────────────────────────────────────
@@ -55,8 +90,9 @@ class AppController:
         # State machine → UI
         self.state_machine.state_changed.connect(self._on_state_changed)
 
-        # Mapping changes → refresh table
-        self.mapping_manager.mappings_changed.connect(self._refresh_table)
+        # Mapping changes → patch dispatch cache and table row
+        self.mapping_manager.mapping_added.connect(self._on_mapping_added)
+        self.mapping_manager.mapping_removed.connect(self._on_mapping_removed)
 
         # UI buttons
         self.window.add_key_requested.connect(self._on_add_key)
@@ -65,19 +101,19 @@ class AppController:
         self.window.setting_changed.connect(self._on_setting_changed)
         self.window.quit_requested.connect(self._on_quit)
 
-        # Input listeners
-        self.keyboard_listener.key_pressed.connect(self._on_key_pressed)
+        # Input listeners (keyboard wakes us once per burst of key presses)
+        self.keyboard_listener.keys_available.connect(self._drain_keys)
         self.mouse_capture.mouse_clicked.connect(self._on_mouse_clicked)
 
     def _initialize_ui(self) -> None:
         """Load persisted state into the UI."""
-        settings = self.config.get_settings()
+        settings = self._cached_settings
         self.window.set_settings_ui(
             restore=settings.get("restore_mouse_position", True),
             foreground=settings.get("require_foreground_window", False),
         )
         self._refresh_table()
-        self.window.set_status("Ready — press a mapped key or add a new mapping.")
+        self._queue_status("Ready — press a mapped key or add a new mapping.")
 
     # ──────────────────────────────────────────────────────────────────
     # State machine reactions
@@ -90,44 +126,48 @@ class AppController:
     # Key press handling (NORMAL mode + CONFIG flow)
     # ──────────────────────────────────────────────────────────────────
 
+    def _drain_keys(self) -> None:
+        for key_name in self.keyboard_listener.drain():
+            self._on_key_pressed(key_name)
+
     def _on_key_pressed(self, key_name: str) -> None:
         state = self.state_machine.state
 
-        if state == AppState.CONFIG_WAIT_KEY:
+        # Fast reject: most keystrokes in NORMAL mode are unmapped
+        if state is _S_NORMAL and key_name not in self._fast_map:
+            return
+
+        if state is _S_WAIT_KEY:
             # ── Config Step 1: capture the key ──
             self._pending_key = key_name
-            self.state_machine.transition(AppState.CONFIG_WAIT_CLICK)
-            self.window.set_status(
+            self.state_machine.transition(_S_WAIT_CLICK)
+            self._queue_status(
                 f'Key "{key_name}" captured.  Now click on the target screen position.'
             )
             # Start one-shot mouse capture
             self.mouse_capture.start()
             return
 
-        if state == AppState.NORMAL:
+        if state is _S_NORMAL:
             # ── Normal mode: execute mapped click ──
-            mapping = self.mapping_manager.get_mapping(key_name)
-            if mapping is None:
-                return  # unmapped key — ignore
-
-            x, y = mapping
+            x, y = self._fast_map[key_name]
 
             # Foreground check
-            if self.config.get_setting("require_foreground_window", False):
-                title = self.config.get_setting("target_window_title", "Valeton")
-                if not is_target_window_foreground(title):
+            settings = self._cached_settings
+            if settings.get("require_foreground_window", False):
+                if not is_target_window_foreground_lower(self._target_title_lower):
                     return  # target window not in focus
 
-            restore = self.config.get_setting("restore_mouse_position", True)
+            restore = settings.get("restore_mouse_position", True)
             execute_click(x, y, restore_position=restore)
-            self.window.set_status(f'Executed click at ({x}, {y}) for key "{key_name}".')
+            self._queue_status(f'Executed click at ({x}, {y}) for key "{key_name}".')
 
     # ──────────────────────────────────────────────────────────────────
     # Mouse click capture (CONFIG flow step 2)
     # ──────────────────────────────────────────────────────────────────
 
     def _on_mouse_clicked(self, x: int, y: int) -> None:
-        if self.state_machine.state != AppState.CONFIG_WAIT_CLICK:
+        if self.state_machine.state is not _S_WAIT_CLICK:
             return
 
         key = self._pending_key
@@ -135,9 +175,9 @@ class AppController:
 
         if key is not None:
             self.mapping_manager.add_mapping(key, x, y)
-            self.window.set_status(f'Mapping saved: "{key}" → ({x}, {y})')
+            self._queue_status(f'Mapping saved: "{key}" → ({x}, {y})')
 
-        self.state_machine.transition(AppState.NORMAL)
+        self.state_machine.transition(_S_NORMAL)
 
     # ──────────────────────────────────────────────────────────────────
     # UI button handlers
@@ -145,41 +185,80 @@ class AppController:
 
     def _on_add_key(self) -> None:
         """Start configuration flow (enter CONFIG_WAIT_KEY)."""
-        if self.state_machine.state == AppState.DISABLED:
-            self.window.set_status("Enable the system before adding keys.")
+        if self.state_machine.state is _S_DISABLED:
+            self._queue_status("Enable the system before adding keys.")
             return
-        if self.state_machine.transition(AppState.CONFIG_WAIT_KEY):
-            self.window.set_status("Press the key you want to configure…")
+        if self.state_machine.transition(_S_WAIT_KEY):
+            self._queue_status("Press the key you want to configure…")
 
     def _on_remove_key(self) -> None:
         """Remove the currently selected mapping from the table."""
         key = self.window.selected_key()
         if key is None:
-            self.window.set_status("Select a mapping to remove first.")
+            self._queue_status("Select a mapping to remove first.")
             return
         if self.mapping_manager.remove_mapping(key):
-            self.window.set_status(f'Removed mapping for "{key}".')
+            self._queue_status(f'Removed mapping for "{key}".')
         else:
-            self.window.set_status(f'Key "{key}" not found.')
+            self._queue_status(f'Key "{key}" not found.')
 
     def _on_toggle_system(self) -> None:
         """Toggle between NORMAL and DISABLED."""
         if self.state_machine.is_disabled():
             self.state_machine.transition(AppState.NORMAL)
-            self.window.set_status("System enabled.")
+            self._queue_status("System enabled.")
         elif self.state_machine.is_normal():
             self.state_machine.transition(AppState.DISABLED)
-            self.window.set_status("System disabled — no keys will trigger clicks.")
+            self._queue_status("System disabled — no keys will trigger clicks.")
 
     def _on_setting_changed(self, key: str, value: object) -> None:
         """Persist a settings toggle from the UI."""
+        self._cached_settings[key] = value
+        if key == "target_window_title":
+            self._target_title_lower = str(value).lower()
         self.config.update_setting(key, value)
-        self.window.set_status(f'Setting "{key}" updated to {value}.')
+        self._update_foreground_watch()
+        self._queue_status(f'Setting "{key}" updated to {value}.')
 
     # ──────────────────────────────────────────────────────────────────
     # Helpers
     # ──────────────────────────────────────────────────────────────────
 
+    def _queue_status(self, text: str) -> None:
+        """
+        Show *text* in the status bar within STATUS_COALESCE_MS.
+
+        Bursts of updates (e.g. auto-repeat clicks) collapse into a
+        single repaint showing only the latest message.
+        """
+        if self._pending_status is None:
+            QTimer.singleShot(STATUS_COALESCE_MS, self._flush_status)
+        self._pending_status = text
+
+    def _flush_status(self) -> None:
+        if self._pending_status is not None:
+            self.window.set_status(self._pending_status)
+            self._pending_status = None
+
+    def _update_foreground_watch(self) -> None:
+        """Install the foreground hook once the foreground check is enabled."""
+        if self._cached_settings.get("require_foreground_window", False):
+            watch_foreground_window(self._target_title_lower)
+
+    def _on_mapping_added(self, key: str, x: int, y: int) -> None:
+        self._fast_map[key] = (x, y)
+        self.window.add_mapping_row(key, x, y)
+
+    def _on_mapping_removed(self, key: str) -> None:
+        self._fast_map.pop(key, None)
+        self.window.remove_mapping_row(key)
+
+    def _rebuild_fast_map(self) -> None:
+        self._fast_map = {
+            k: (v["x"], v["y"])
+            for k, v in self.mapping_manager.get_all_mappings().items()
+        }
+
     def _refresh_table(self) -> None:
         self.window.refresh_mappings(self.mapping_manager.get_all_mappings())
 
@@ -187,6 +266,7 @@ class AppController:
         """Graceful shutdown."""
         self.keyboard_listener.stop()
         self.mouse_capture.stop()
+        self.config.flush()
         QApplication.instance().quit()
 
     def show(self) -> None:
@@ -201,6 +281,8 @@ def main():
     app = QApplication(sys.argv)
     app.setApplicationName("KeyClick")
     app.setQuitOnLastWindowClosed(False)  # keep running in tray
+    app.setStyle(KeyClickProxyStyle())  # checkbox geometry, see ui.py
+    app.setStyleSheet(STYLESHEET)  # parsed once, before any widget exists
 
     controller = AppController()
     controller.show()
@@ -5,7 +5,7 @@ Thin layer between ConfigManager and the rest of the application,
 providing a signal-driven API for mapping mutations.
 """
 
-from typing import Dict, Optional, Tuple
+from typing import Dict, Mapping, Optional, Tuple
 from PyQt6.QtCore import QObject, pyqtSignal
 from config_manager import ConfigManager
 
@@ -16,9 +16,16 @@ class MappingManager(QObject):
 
     Signals:
         mappings_changed(): emitted after any add/remove operation.
+        mapping_added(str, int, int): emitted with (key, x, y) after an
+                                      add or overwrite.
+        mapping_removed(str): emitted with the key after a removal.
     """
 
     mappings_changed = pyqtSignal()
+    mapping_added = pyqtSignal(str, int, int)
+    mapping_removed = pyqtSignal(str)
+
+    __slots__ = ("_config",)
 
     def __init__(self, config: ConfigManager):
         super().__init__()
@@ -27,18 +34,20 @@ class MappingManager(QObject):
     def add_mapping(self, key: str, x: int, y: int) -> None:
         """Add or overwrite a mapping and notify listeners."""
         self._config.set_mapping(key, x, y)
+        self.mapping_added.emit(key, x, y)
         self.mappings_changed.emit()
 
     def remove_mapping(self, key: str) -> bool:
         """Remove a mapping by key. Returns True if it existed."""
         removed = self._config.remove_mapping(key)
         if removed:
+            self.mapping_removed.emit(key)
             self.mappings_changed.emit()
         return removed
 
-    def get_all_mappings(self) -> Dict[str, Dict[str, int]]:
-        """Return all mappings as {key: {"x": ..., "y": ...}}."""
-        return self._config.get_mappings()
+    def get_all_mappings(self) -> Mapping[str, Dict[str, int]]:
+        """Return a read-only view of all mappings as {key: {"x": ..., "y": ...}}."""
+        return self._config.mappings_view()
 
     def get_mapping(self, key: str) -> Optional[Tuple[int, int]]:
         """Return (x, y) for *key*, or None."""
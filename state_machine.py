@@ -34,23 +34,37 @@ VALID_TRANSITIONS = {
 }
 
 
+def _build_transition_mask() -> tuple[int, ...]:
+    """Encode VALID_TRANSITIONS as one bitmask per state, indexed by value."""
+    masks = [0] * (max(state.value for state in AppState) + 1)
+    for source, targets in VALID_TRANSITIONS.items():
+        for target in targets:
+            masks[source.value] |= 1 << target.value
+    return tuple(masks)
+
+
+# Bit n of _TRANSITION_MASK[s.value] is set ⇔ s → (state with value n) is valid
+_TRANSITION_MASK = _build_transition_mask()
+
+
 class StateMachine(QObject):
     """
     Manages application state with validated transitions.
 
+    ``state`` is a plain attribute for cheap reads; only transition()
+    should assign it.
+
     Signals:
         state_changed(AppState): emitted whenever the state changes.
     """
 
     state_changed = pyqtSignal(object)  # AppState
 
+    __slots__ = ("state",)
+
     def __init__(self, initial_state: AppState = AppState.NORMAL):
         super().__init__()
-        self._state = initial_state
-
-    @property
-    def state(self) -> AppState:
-        return self._state
+        self.state: AppState = initial_state
 
     def transition(self, new_state: AppState) -> bool:
         """
@@ -59,22 +73,21 @@ class StateMachine(QObject):
         Returns True if the transition was valid and executed,
         False if the transition is not allowed.
         """
-        if new_state == self._state:
+        if new_state == self.state:
             return True  # no-op
 
-        allowed = VALID_TRANSITIONS.get(self._state, set())
-        if new_state not in allowed:
+        if not (_TRANSITION_MASK[self.state.value] >> new_state.value) & 1:
             return False
 
-        self._state = new_state
-        self.state_changed.emit(self._state)
+        self.state = new_state
+        self.state_changed.emit(self.state)
         return True
 
     def is_normal(self) -> bool:
-        return self._state == AppState.NORMAL
+        return self.state == AppState.NORMAL
 
     def is_config(self) -> bool:
-        return self._state in (AppState.CONFIG_WAIT_KEY, AppState.CONFIG_WAIT_CLICK)
+        return self.state in (AppState.CONFIG_WAIT_KEY, AppState.CONFIG_WAIT_CLICK)
 
     def is_disabled(self) -> bool:
-        return self._state == AppState.DISABLED
+        return self.state == AppState.DISABLED
@@ -10,20 +10,40 @@ Provides the main window with:
   • System-tray icon with context menu
 """
 
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QAction, QIcon, QFont, QColor
+import sys
+from array import array
+from bisect import bisect_left
+from functools import partial
+
+from PyQt6.QtCore import (
+    Qt, QAbstractTableModel, QModelIndex, QSignalBlocker, pyqtSignal, pyqtSlot,
+)
+from PyQt6.QtGui import QAction, QIcon, QFont, QColor, QCursor
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QPushButton, QTableWidget, QTableWidgetItem, QHeaderView,
+    QPushButton, QTableView, QHeaderView,
     QCheckBox, QSystemTrayIcon, QMenu, QFrame, QApplication,
-    QAbstractItemView, QGroupBox,
+    QAbstractItemView, QGroupBox, QProxyStyle, QStyle,
 )
 
 from state_machine import AppState
 
 
+# Setting keys emitted via setting_changed (interned: the controller uses
+# them as dict keys in its settings cache)
+_RESTORE_KEY = sys.intern("restore_mouse_position")
+_FG_KEY = sys.intern("require_foreground_window")
+
+# All MainWindow connections are GUI-thread → GUI-thread, so they can skip
+# AutoConnection's per-emit thread-affinity check.
+_DIRECT = Qt.ConnectionType.DirectConnection
+
+
 # ──────────────────────────────────────────────────────────────────────
 # Stylesheet (Dark theme with teal accent)
+#
+# Installed once on the QApplication (see main.main) so Qt parses it a
+# single time and shares selector matching across every widget.
 # ──────────────────────────────────────────────────────────────────────
 
 STYLESHEET = """
@@ -94,7 +114,7 @@ QPushButton#toggleBtn {
     border-color: #89b4fa;
 }
 
-QTableWidget {
+QTableView {
     background-color: #181825;
     alternate-background-color: #1e1e2e;
     border: 1px solid #313244;
@@ -103,7 +123,7 @@ QTableWidget {
     selection-background-color: #45475a;
     padding: 2px;
 }
-QTableWidget::item {
+QTableView::item {
     padding: 6px 10px;
 }
 QHeaderView::section {
@@ -116,7 +136,6 @@ QHeaderView::section {
 }
 
 QCheckBox {
-    spacing: 8px;
     color: #cdd6f4;
 }
 QCheckBox::indicator {
@@ -147,6 +166,35 @@ QGroupBox::title {
 """
 
 
+class KeyClickProxyStyle(QProxyStyle):
+    """
+    Application style supplying fixed checkbox label spacing as an int.
+
+    STYLESHEET keeps colours, borders, radii and box sizes; metrics it
+    leaves out fall through to this style instead of going through QSS
+    selector resolution.  Install with QApplication.setStyle() before
+    the sheet.
+    """
+
+    _METRICS = {
+        QStyle.PixelMetric.PM_CheckBoxLabelSpacing: 8,
+    }
+
+    def pixelMetric(self, metric, option=None, widget=None) -> int:
+        value = self._METRICS.get(metric)
+        if value is not None:
+            return value
+        return super().pixelMetric(metric, option, widget)
+
+
+def _by_state_value(table: dict) -> tuple:
+    """Flatten an AppState-keyed dict into a tuple indexed by state.value."""
+    values = [""] * (max(state.value for state in AppState) + 1)
+    for state, value in table.items():
+        values[state.value] = value
+    return tuple(values)
+
+
 # Badge colours per state
 _BADGE_STYLES = {
     AppState.NORMAL: "background-color: #1e6640; color: #a6e3a1;",
@@ -155,12 +203,127 @@ _BADGE_STYLES = {
     AppState.DISABLED: "background-color: #6e2532; color: #f38ba8;",
 }
 
-_BADGE_TEXT = {
+# Full badge stylesheet per state, composed once so update_state()
+# doesn't rebuild the string on every call; indexed by AppState.value
+_BADGE_COMMON_STYLE = (
+    " font-size: 13px; font-weight: bold; "
+    "padding: 5px 14px; border-radius: 8px; min-width: 120px;"
+)
+_BADGE_FULL_STYLES = _by_state_value({
+    state: style + _BADGE_COMMON_STYLE for state, style in _BADGE_STYLES.items()
+})
+
+# Badge label per state, indexed by AppState.value
+_BADGE_TEXT = _by_state_value({
     AppState.NORMAL: "● NORMAL",
     AppState.CONFIG_WAIT_KEY: "◉ CONFIG — Key",
     AppState.CONFIG_WAIT_CLICK: "◉ CONFIG — Click",
     AppState.DISABLED: "■ DISABLED",
-}
+})
+
+
+class MappingsModel(QAbstractTableModel):
+    """
+    Read-only table model for key → (x, y) mappings, sorted by key.
+
+    Rows are stored column-wise in parallel sequences (key names plus
+    two int arrays) rather than one item object per cell.  The display
+    strings for the coordinates are built once per edit and cached
+    alongside, since data() runs for every visible cell on each repaint.
+    """
+
+    _HEADERS = ("Key", "X", "Y")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._keys: list[str] = []
+        self._xs = array("i")
+        self._ys = array("i")
+        self._x_text: list[str] = []
+        self._y_text: list[str] = []
+        # Flyweight pool: one display string per distinct coordinate value
+        self._text_pool: dict[int, str] = {}
+
+    # ── QAbstractTableModel interface ──
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._keys)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else 3
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if col == 0:
+            return self._keys[row]
+        if col == 1:
+            return self._x_text[row]
+        return self._y_text[row]
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.ItemDataRole.DisplayRole):
+        if (role == Qt.ItemDataRole.DisplayRole
+                and orientation == Qt.Orientation.Horizontal):
+            return self._HEADERS[section]
+        return None
+
+    # ── Mutation API ──
+
+    def set_mappings(self, mappings: dict) -> None:
+        """Replace all rows with *mappings* in a single model reset."""
+        items = sorted(mappings.items())
+        self.beginResetModel()
+        self._keys = [key for key, _ in items]
+        self._xs = array("i", (coords["x"] for _, coords in items))
+        self._ys = array("i", (coords["y"] for _, coords in items))
+        self._x_text = [self._coord_text(x) for x in self._xs]
+        self._y_text = [self._coord_text(y) for y in self._ys]
+        self.endResetModel()
+
+    def upsert(self, key: str, x: int, y: int) -> None:
+        """Insert or update the row for *key*, keeping rows sorted."""
+        row = bisect_left(self._keys, key)
+        if row < len(self._keys) and self._keys[row] == key:
+            if self._xs[row] == x and self._ys[row] == y:
+                return
+            self._xs[row] = x
+            self._ys[row] = y
+            self._x_text[row] = self._coord_text(x)
+            self._y_text[row] = self._coord_text(y)
+            self.dataChanged.emit(self.index(row, 1), self.index(row, 2))
+            return
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._keys.insert(row, key)
+        self._xs.insert(row, x)
+        self._ys.insert(row, y)
+        self._x_text.insert(row, self._coord_text(x))
+        self._y_text.insert(row, self._coord_text(y))
+        self.endInsertRows()
+
+    def remove(self, key: str) -> None:
+        """Remove the row for *key*, if present."""
+        row = bisect_left(self._keys, key)
+        if row == len(self._keys) or self._keys[row] != key:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._keys[row]
+        del self._xs[row]
+        del self._ys[row]
+        del self._x_text[row]
+        del self._y_text[row]
+        self.endRemoveRows()
+
+    def key_at(self, row: int) -> str:
+        return self._keys[row]
+
+    def _coord_text(self, value: int) -> str:
+        """Return the shared display string for coordinate *value*."""
+        text = self._text_pool.get(value)
+        if text is None:
+            text = self._text_pool[value] = str(value)
+        return text
 
 
 class MainWindow(QMainWindow):
@@ -181,12 +344,18 @@ class MainWindow(QMainWindow):
     setting_changed = pyqtSignal(str, object)
     quit_requested = pyqtSignal()
 
+    # Shared tray icon, resolved on first use (needs a QApplication)
+    _tray_icon: QIcon | None = None
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("KeyClick — Keyboard → Mouse Mapper")
         self.setMinimumSize(520, 520)
         self.resize(560, 600)
-        self.setStyleSheet(STYLESHEET)
+        # STYLESHEET is applied app-wide by main(), not per window
+
+        # Last state rendered by update_state (None until first call)
+        self._current_state: AppState | None = None
 
         self._build_ui()
         self._build_tray()
@@ -223,8 +392,9 @@ class MainWindow(QMainWindow):
         root.addWidget(self._status)
 
         # ── Mapping table ──
-        self._table = QTableWidget(0, 3)
-        self._table.setHorizontalHeaderLabels(["Key", "X", "Y"])
+        self._model = MappingsModel(self)
+        self._table = QTableView()
+        self._table.setModel(self._model)
         self._table.setAlternatingRowColors(True)
         self._table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self._table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
@@ -259,36 +429,51 @@ class MainWindow(QMainWindow):
         root.addWidget(settings_box)
 
     def _build_tray(self) -> None:
-        """Set up system tray icon and its context menu."""
+        """Set up the system tray icon (its menu is built on first use)."""
         self._tray = QSystemTrayIcon(self)
-        # Use the default app icon; fallback to a themed icon
-        icon = self.style().standardIcon(
-            self.style().StandardPixmap.SP_ComputerIcon
-        )
-        self._tray.setIcon(icon)
+        self._tray.setIcon(self._get_tray_icon())
         self._tray.setToolTip("KeyClick")
-
-        menu = QMenu()
-        show_action = menu.addAction("Show")
-        show_action.triggered.connect(self._show_from_tray)
-        hide_action = menu.addAction("Hide")
-        hide_action.triggered.connect(self.hide)
-        menu.addSeparator()
-        quit_action = menu.addAction("Quit")
-        quit_action.triggered.connect(self.quit_requested.emit)
-        self._tray.setContextMenu(menu)
-        self._tray.activated.connect(self._on_tray_activated)
+        self._tray_menu: QMenu | None = None
+        self._tray.activated.connect(self._on_tray_activated, _DIRECT)
         self._tray.show()
 
+    @classmethod
+    def _get_tray_icon(cls) -> QIcon:
+        """Return the tray icon, resolving it from the app style once."""
+        if cls._tray_icon is None:
+            # Use the default app icon; fallback to a themed icon
+            cls._tray_icon = QApplication.style().standardIcon(
+                QStyle.StandardPixmap.SP_ComputerIcon
+            )
+        return cls._tray_icon
+
+    def _get_tray_menu(self) -> QMenu:
+        """Return the tray context menu, building it on first request."""
+        if self._tray_menu is None:
+            menu = QMenu(self)
+            show_action = menu.addAction("Show")
+            show_action.triggered.connect(self._show_from_tray, _DIRECT)
+            hide_action = menu.addAction("Hide")
+            hide_action.triggered.connect(self.hide, _DIRECT)
+            menu.addSeparator()
+            quit_action = menu.addAction("Quit")
+            quit_action.triggered.connect(self.quit_requested, _DIRECT)
+            self._tray_menu = menu
+        return self._tray_menu
+
     def _connect_signals(self) -> None:
-        self._add_btn.clicked.connect(self.add_key_requested.emit)
-        self._remove_btn.clicked.connect(self.remove_key_requested.emit)
-        self._toggle_btn.clicked.connect(self.toggle_system_requested.emit)
+        # Signal-to-signal connections are relayed entirely by Qt, with
+        # no Python frame per click.
+        self._add_btn.clicked.connect(self.add_key_requested, _DIRECT)
+        self._remove_btn.clicked.connect(self.remove_key_requested, _DIRECT)
+        self._toggle_btn.clicked.connect(self.toggle_system_requested, _DIRECT)
+        # Pre-bind the setting key so each toggle calls emit directly
+        emit_setting = self.setting_changed.emit
         self._chk_restore.toggled.connect(
-            lambda v: self.setting_changed.emit("restore_mouse_position", v)
+            partial(emit_setting, _RESTORE_KEY), _DIRECT
         )
         self._chk_foreground.toggled.connect(
-            lambda v: self.setting_changed.emit("require_foreground_window", v)
+            partial(emit_setting, _FG_KEY), _DIRECT
         )
 
     # ──────────────────────────────────────────────────────────────────
@@ -297,11 +482,12 @@ class MainWindow(QMainWindow):
 
     def update_state(self, state: AppState) -> None:
         """Update the mode badge and button labels to reflect *state*."""
-        self._mode_badge.setText(_BADGE_TEXT.get(state, ""))
-        self._mode_badge.setStyleSheet(
-            _BADGE_STYLES.get(state, "") + " font-size: 13px; font-weight: bold; "
-            "padding: 5px 14px; border-radius: 8px; min-width: 120px;"
-        )
+        if state == self._current_state:
+            return  # nothing to restyle; avoids a QSS reparse
+        self._current_state = state
+
+        self._mode_badge.setText(_BADGE_TEXT[state.value])
+        self._mode_badge.setStyleSheet(_BADGE_FULL_STYLES[state.value])
 
         is_config = state in (AppState.CONFIG_WAIT_KEY, AppState.CONFIG_WAIT_CLICK)
         self._add_btn.setEnabled(not is_config)
@@ -319,44 +505,53 @@ class MainWindow(QMainWindow):
 
     def set_settings_ui(self, restore: bool, foreground: bool) -> None:
         """Initialise checkbox states (without emitting signals)."""
-        self._chk_restore.blockSignals(True)
-        self._chk_foreground.blockSignals(True)
-        self._chk_restore.setChecked(restore)
-        self._chk_foreground.setChecked(foreground)
-        self._chk_restore.blockSignals(False)
-        self._chk_foreground.blockSignals(False)
+        with QSignalBlocker(self._chk_restore), QSignalBlocker(self._chk_foreground):
+            self._chk_restore.setChecked(restore)
+            self._chk_foreground.setChecked(foreground)
 
     def refresh_mappings(self, mappings: dict) -> None:
         """Rebuild the mapping table from scratch."""
-        self._table.setRowCount(0)
-        for key, coords in sorted(mappings.items()):
-            row = self._table.rowCount()
-            self._table.insertRow(row)
-            self._table.setItem(row, 0, QTableWidgetItem(key))
-            self._table.setItem(row, 1, QTableWidgetItem(str(coords["x"])))
-            self._table.setItem(row, 2, QTableWidgetItem(str(coords["y"])))
+        self._model.set_mappings(mappings)
+
+    def add_mapping_row(self, key: str, x: int, y: int) -> None:
+        """Insert or update the row for *key*, keeping rows sorted."""
+        self._model.upsert(key, x, y)
+
+    def remove_mapping_row(self, key: str) -> None:
+        """Remove the row for *key*, if present, and clear the selection."""
+        self._model.remove(key)
+        # Qt would otherwise move the selection onto a neighbouring row,
+        # and a second "Remove Selected" click would delete that mapping.
+        self._table.clearSelection()
 
     def selected_key(self) -> str | None:
         """Return the key column value of the currently selected row."""
-        items = self._table.selectedItems()
-        if items:
-            row = items[0].row()
-            key_item = self._table.item(row, 0)
-            if key_item:
-                return key_item.text()
-        return None
+        row = self._table.currentIndex().row()
+        # clearSelection() (see remove_mapping_row) keeps the current
+        # index, so only trust it while its row is actually selected
+        if row < 0 or not self._table.selectionModel().isRowSelected(row):
+            return None
+        return self._model.key_at(row)
 
     # ──────────────────────────────────────────────────────────────────
     # Tray helpers
     # ──────────────────────────────────────────────────────────────────
 
+    @pyqtSlot()
     def _show_from_tray(self) -> None:
         self.showNormal()
         self.activateWindow()
 
-    def _on_tray_activated(self, reason) -> None:
+    @pyqtSlot(QSystemTrayIcon.ActivationReason)
+    def _on_tray_activated(self, reason: QSystemTrayIcon.ActivationReason) -> None:
         if reason == QSystemTrayIcon.ActivationReason.DoubleClick:
             self._show_from_tray()
+        elif reason == QSystemTrayIcon.ActivationReason.Context:
+            menu = self._get_tray_menu()
+            menu.popup(QCursor.pos())
+            # Like Qt's own tray handling: without focus the popup may not
+            # close when the user clicks elsewhere
+            menu.activateWindow()
 
     def closeEvent(self, event) -> None:
         """Minimize to tray instead of closing."""